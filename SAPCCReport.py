@@ -1,20 +1,57 @@
 import openpyxl as pyxl
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 from abc import ABC
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Self
+
+try:
+    # optional, much faster reader for the export. openpyxl is used when it is not installed
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
 
 ''' An absctract class to represent a SAP CC Excel export report'''
 PRIMARY_SHEETNAME:str = "CommerceProduct"
 
+def _load_openpyxl_workbook(report_path: Path) -> pyxl.Workbook:
+    return pyxl.load_workbook(report_path.as_posix(), read_only=True, data_only=True)
+
 @dataclass
 class SAPCCReportFile:
     report_path:Path
-    report_workbook:pyxl.Workbook
+    report_workbook:pyxl.Workbook | None = None
+    # only used to read row values, see SAPCCExportReport._iter_row_values
+    calamine_workbook:"CalamineWorkbook | None" = None
+
+    def get_openpyxl_workbook(self) -> pyxl.Workbook:
+        ''' Returns the openpyxl workbook, loading it on first use if the file was opened with calamine'''
+        if self.report_workbook is None:
+            self.report_workbook = _load_openpyxl_workbook(self.report_path)
+        return self.report_workbook
+
+    def close(self):
+        '''
+        Releases the report file. Read only openpyxl workbooks keep it open until closed explicitly,
+        and a calamine-opened file may also have an openpyxl reader from get_openpyxl_workbook.
+        '''
+        if self.report_workbook is not None:
+            self.report_workbook.close()
+        if self.calamine_workbook is not None:
+            self.calamine_workbook.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 def reprt_file_from_path(report_path: Path) -> SAPCCReportFile:
-    wb = pyxl.load_workbook(report_path.as_posix())
-    return SAPCCReportFile(report_path, wb)
+    if CalamineWorkbook is not None:
+        return SAPCCReportFile(report_path, calamine_workbook=CalamineWorkbook.from_path(report_path.as_posix()))
+    return SAPCCReportFile(report_path, _load_openpyxl_workbook(report_path))
 
 class InvalidSAPCCReport(Exception):
     pass
@@ -27,14 +64,30 @@ class SAPCCExportReport(ABC):
 
     @property
     def wb(self) -> pyxl.Workbook:
-        return self._report_file.report_workbook
+        return self._report_file.get_openpyxl_workbook()
     
     @property
     def data_starting_row(self) -> int:
         return 4
     
-    def _get_ws(self, report_file:SAPCCReportFile, sheetname:str=PRIMARY_SHEETNAME) -> Worksheet:
-        return report_file.report_workbook[sheetname]
+    def _get_ws(self, report_file:SAPCCReportFile, sheetname:str=PRIMARY_SHEETNAME) -> Worksheet | ReadOnlyWorksheet:
+        return report_file.get_openpyxl_workbook()[sheetname]
+
+    def _iter_row_values(self, max_col:int, sheetname:str=PRIMARY_SHEETNAME) -> Iterable[Sequence[Any]]:
+        '''
+        Returns the cell values of each data row, starting at data_starting_row,
+        for whichever workbook backend the report file was loaded with.
+        Rows are cut off after max_col and empty cells are None on both backends.
+        Calamine still reads every number as a float.
+        '''
+        calamine_wb = self._report_file.calamine_workbook
+        if calamine_wb is not None:
+            sheet = calamine_wb.get_sheet_by_name(sheetname)
+            rows = sheet.to_python(skip_empty_area=False)[self.data_starting_row - 1:]
+            # calamine gives "" for empty cells where openpyxl gives None
+            return [[None if value == "" else value for value in row[:max_col]] for row in rows]
+        ws = self._get_ws(self._report_file, sheetname)
+        return ws.iter_rows(min_row=self.data_starting_row, min_col=1, max_col=max_col, values_only=True)
     
 
     
@@ -1,43 +1,61 @@
-from pricingreport import AMERPricingFile, ItemPrice
+from pricingreport import AMERPricingFile
 from pathlib import Path
+import csv
+import os
 import openpyxl as pyxl
-from SAPCCReport import SAPCCReportFile
+from SAPCCReport import reprt_file_from_path
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
+HEADER_ITEMS:list[str] = ["SKU", "US Price", "US Sale Price", "CA Price", "CA Sale Price"]
 
-def print_header(output_sheet:Worksheet):
+def print_header(output_sheet:Worksheet | WriteOnlyWorksheet):
     '''
     Prints the column headers to the first row of the sheet
     '''
-    header_items = ["SKU", "US Price", "US Sale Price", "CA Price", "CA Sale Price"]
-    for col_num, header in enumerate(header_items, start=1):
-        output_sheet.cell(row=1, column=col_num, value=header)
-def append_item_price(output_sheet:Worksheet, ip:ItemPrice):
-    '''Prints an item price to the sheet '''
-    output_sheet.append(ip.output_str_value)
+    output_sheet.append(HEADER_ITEMS)
 
 def print_prices(input_path:Path, output_path:Path):
+    '''
+    Takes a path to a price export from SAP CC, parses it, and writes the prices to output_path.
+    A .csv output path is written as plain CSV, anything else as an Excel workbook.
+    '''
+    if output_path.suffix.lower() == ".csv":
+        print_prices_csv(input_path, output_path)
+    else:
+        print_prices_xlsx(input_path, output_path)
+
+def print_prices_xlsx(input_path:Path, output_path:Path):
     ''' Takes a path to a price export from SAP CC, parses it, and creates a new workbook with the data'''
     print("Printing prices")
-    input_file = SAPCCReportFile(input_path, pyxl.load_workbook(input_path))
-    
-    pricing_report = AMERPricingFile(input_file)
-    prices = pricing_report.get_prices()
-    
-    #print output
-    output_wb = pyxl.Workbook()
-    ws = output_wb.active
-    if isinstance(ws, Worksheet):
+    with reprt_file_from_path(input_path) as input_file:
+        pricing_report = AMERPricingFile(input_file)
+
+        #print output
+        output_wb = pyxl.Workbook(write_only=True)
+        ws = output_wb.create_sheet()
         print("printing headers")
         print_header(ws)
 
-        for price in prices:
-            append_item_price(ws, price)
-    else:
-        raise TypeError("Received wrong type of workbook")
-    
-    output_wb.save(output_path)
+        for row in pricing_report.iter_output_rows():
+            ws.append(row)
 
+        output_wb.save(output_path)
 
+def print_prices_csv(input_path:Path, output_path:Path):
+    ''' Takes a path to a price export from SAP CC, parses it, and writes the data to a CSV file'''
+    print("Printing prices")
+    with reprt_file_from_path(input_path) as input_file:
+        pricing_report = AMERPricingFile(input_file)
 
-    
\ No newline at end of file
+        # write next to the output and move into place once done, so a bad row doesn't leave a truncated file
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        try:
+            with open(tmp_path, 'w', newline='', encoding="utf-8") as output_file:
+                writer = csv.writer(output_file)
+                writer.writerow(HEADER_ITEMS)
+                writer.writerows(pricing_report.iter_output_rows())
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
@@ -1,18 +1,27 @@
 from SAPCCReport import SAPCCExportReport
 from enum import Enum
 from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
-from pydantic import BaseModel, model_validator, RootModel, Field, ConfigDict, field_validator
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+from pydantic import RootModel, Field, field_validator
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 from typing import Self, Optional
-from pydantic_core import ValidationError
+from collections.abc import Callable, Iterator
+import msgspec
 
 class Country(Enum):
     # Note, this is currently only designed for AMER
     CA = "ca"
     US = "us"
 
+_US = Country.US
+_CA = Country.CA
+_US_KEY = _US.value
+_CA_KEY = _CA.value
 
-class PriceInfo(BaseModel):
+
+@pydantic_dataclass(slots=True)
+class PriceInfo:
     '''
     Represents pricing information for a product in a specific region.
     
@@ -91,12 +100,64 @@ class ProductPricing(RootModel[dict[str, PriceInfo]]):
     '''
     pass
 
+class _RawPriceInfo(msgspec.Struct):
+    ''' Undecoded pricing for one country, as it appears in the export JSON'''
+    price: Optional[str | float] = None
+    salePrice: Optional[str | float] = None
+
+# built once and reused for every row
+_DECODER = msgspec.json.Decoder(dict[str, _RawPriceInfo])
+_EMPTY_PRICE_INFO = _RawPriceInfo()
+
+_RawPrice = str | float | None
+
+def _to_decimal(raw:_RawPrice) -> Optional[Decimal]:
+    ''' Converts a raw JSON price to a Decimal, treating None and "" as missing'''
+    if raw is None or raw == "":
+        return None
+    return Decimal(raw) if isinstance(raw, str) else Decimal(str(raw))
+
+def _to_float(raw:_RawPrice) -> float:
+    ''' Converts a raw JSON price to a float, treating None and "" as 0'''
+    if raw is None or raw == "":
+        return 0.0
+    return float(raw)
+
+def _decode_price_json[T](json_str:str, convert:Callable[[_RawPrice], T]) -> tuple[T, T, T, T]:
+    '''
+    Decodes a price JSON string into (US price, US sale price, CA price, CA sale price),
+    passing each raw price through convert. Reports the json if it or any of its prices are invalid.
+    '''
+    try:
+        prices = _DECODER.decode(json_str)
+        us = prices.get(_US_KEY) or _EMPTY_PRICE_INFO
+        ca = prices.get(_CA_KEY) or _EMPTY_PRICE_INFO
+        return convert(us.price), convert(us.salePrice), convert(ca.price), convert(ca.salePrice)
+    except (msgspec.DecodeError, InvalidOperation, ValueError) as e:
+        print(f"Received the following invalid json: {json_str}")
+        raise e
+
+# Both parsers are cached on the raw string since many products in an export share the same pricing
+
+@lru_cache(maxsize=4096)
+def _parse_price_json(json_str:str) -> tuple[Optional[Decimal], Optional[Decimal], Optional[Decimal], Optional[Decimal]]:
+    ''' Parses a price JSON string into Decimal (US price, US sale price, CA price, CA sale price)'''
+    return _decode_price_json(json_str, _to_decimal)
+
+@lru_cache(maxsize=4096)
+def _parse_output_prices(json_str:str) -> tuple[float, float, float, float]:
+    '''
+    Parses a price JSON string straight into the float (US price, US sale price, CA price, CA sale price)
+    written to the output sheet, with missing prices as 0.
+    '''
+    return _decode_price_json(json_str, _to_float)
+
 @dataclass(slots=True)
 class CountryPrice:
     '''
     Contains the pricing from the file
     '''
-    sku:str
+    sku:str | int
     price: Optional[Decimal]
     sale_price: Optional[Decimal]
     country: Country
@@ -107,12 +168,14 @@ class MissingCountryError(ValueError):
 class WrongSKUError(ValueError):
     ...
 
-class ItemPrice(BaseModel):
-    model_config = ConfigDict(frozen=True)
+@dataclass(slots=True, frozen=True)
+class ItemPrice:
     sku:str | int
     prices:dict[Country, CountryPrice]
 
-    @model_validator(mode="after")
+    def __post_init__(self):
+        self.validate_prices()
+
     def validate_prices(self) -> Self:
         for price in self.prices.values():
             if price.sku != self.sku:
@@ -121,24 +184,23 @@ class ItemPrice(BaseModel):
             raise MissingCountryError(f"Missing price for {self.sku}: {self.prices}")
         return self
     
-    def _price_or_zero(self, price:Optional[Decimal]) -> str:
-        ''' returns "0" if an optional price is None, else returns str of the price'''
-        return str(price) if price else "0"
-        
     @property
-    def output_str_value(self) -> list[str | float]:
+    def output_str_value(self) -> list[str | int | float]:
         ''' 
         returns the string values of the prices in the following order:
 
         "SKU", "US Price", "US Sale Price", "CA Price", "CA Sale Price"
-        '''
 
+        Missing prices are returned as 0.0.
+        '''
+        us = self.prices[_US]
+        ca = self.prices[_CA]
         return [
-            str(self.sku),
-            float(self._price_or_zero(self.prices[Country.US].price)),
-            float(self._price_or_zero(self.prices[Country.US].sale_price)),
-            float(self._price_or_zero(self.prices[Country.CA].price)),
-            float(self._price_or_zero(self.prices[Country.CA].sale_price))
+            self.sku,
+            0.0 if us.price is None else float(us.price),
+            0.0 if us.sale_price is None else float(us.sale_price),
+            0.0 if ca.price is None else float(ca.price),
+            0.0 if ca.sale_price is None else float(ca.sale_price)
         ]
 class PricingFile(SAPCCExportReport):
     '''
@@ -156,21 +218,18 @@ class PricingFile(SAPCCExportReport):
     SKU_COL = 3
 
     @staticmethod
-    def get_pricing_from_JSON(json_str:str, sku:str) -> dict[Country, CountryPrice]:
-        try:
-            prices = ProductPricing.model_validate_json(json_str)
-            countryprices:dict[Country, CountryPrice] = {}
-            for country in Country:
-                countryprices[country] = CountryPrice(
-                    sku=sku,
-                    price=prices.root[country.value].price,
-                    sale_price=prices.root[country.value].salePrice,
-                    country=country
-                )
-            return countryprices
-        except ValidationError as e:
-            print(f"Received the following invalid json: {json_str}")
-            raise e
+    def get_pricing_from_JSON(json_str:str, sku:str | int) -> dict[Country, CountryPrice]:
+        '''
+        Parses the price JSON into a CountryPrice per country.
+
+        Same shape as ProductPricing, but decoded with the shared msgspec
+        decoder since this runs once per row.
+        '''
+        us_price, us_sale, ca_price, ca_sale = _parse_price_json(json_str)
+        return {
+            _US: CountryPrice(sku, us_price, us_sale, _US),
+            _CA: CountryPrice(sku, ca_price, ca_sale, _CA),
+        }
 
             
 class AMERPricingFile(PricingFile):
@@ -186,15 +245,42 @@ class AMERPricingFile(PricingFile):
     AMER specific implementation. 
     '''
 
+    def _iter_sku_json(self) -> Iterator[tuple[str | int, str]]:
+        ''' Yields the (sku, price json) pair of each data row. SKUs keep their cell type if str or int'''
+        # bind invariants locally, the loop runs once per row in the sheet
+        sku_col = self.SKU_COL
+        json_col = self.JSON_PRICE_COL
+        max_col = max(json_col, sku_col) + 1
+        for row in self._iter_row_values(max_col):
+            sku_val = row[sku_col]
+            json_val = row[json_col]
+            if isinstance(sku_val, float) and sku_val.is_integer():
+                # calamine reads every number as a float, openpyxl gives integral SKUs as int
+                sku_val = int(sku_val)
+            sku = sku_val if isinstance(sku_val, (str, int)) else str(sku_val)
+            # price json is already a str unless the cell is empty
+            yield sku, json_val if isinstance(json_val, str) else str(json_val)
+
     def get_prices(self) -> list[ItemPrice]:
         item_prices:list[ItemPrice] = []
-        ws = self._get_ws(self._report_file)
-        for row in ws.iter_rows(min_row=self.data_starting_row):
-            sku = str(row[self.SKU_COL].value)
-            country_prices = self.get_pricing_from_JSON(str(row[self.JSON_PRICE_COL].value), sku)
-            item_prices.append(ItemPrice(
+        parse = self.get_pricing_from_JSON
+        append = item_prices.append
+        for sku, json_str in self._iter_sku_json():
+            country_prices = parse(json_str, sku)
+            append(ItemPrice(
                 sku=sku,
                 prices = country_prices
                 )
             )
         return item_prices
+
+    def iter_output_rows(self) -> Iterator[list[str | int | float]]:
+        '''
+        Yields each product as an output row, in the same order as ItemPrice.output_str_value:
+
+        "SKU", "US Price", "US Sale Price", "CA Price", "CA Sale Price"
+
+        Skips building ItemPrice/CountryPrice objects, for callers that only print the prices.
+        '''
+        for sku, json_str in self._iter_sku_json():
+            yield [sku, *_parse_output_prices(json_str)]